@@ -1,53 +1,322 @@
 """AI-powered analysis for diary entries."""
 
+import asyncio
+import hashlib
+import heapq
+import json
 import re
-from typing import List, Optional
-
+import threading
+from array import array
+from collections import OrderedDict, deque
+from contextlib import aclosing
+from pathlib import Path
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from .config import CACHE_DIR, OLLAMA_NUM_PARALLEL, THEME_CACHE_SIZE
+from .cache import ThemeCache
 from .ollama_client import ollama_client
 from .entry_manager import entry_manager
 from .logger import analysis_logger as logger, log_section
+from .similarity import LSHIndex, ShingleVocabulary, mask_jaccard, minhash, shingles, simhash
+
+SIGNATURES_FILE = CACHE_DIR / "signatures.json"
+THEMES_DB = CACHE_DIR / "themes.db"
+THEME_BATCH_CHARS = 6000
+NEAR_DUPLICATE_BITS = 3
+SIMILARITY_THRESHOLD = 0.08
+
+# Section bodies are located by matching only the header and then scanning
+# forward for the next boundary, instead of a lazy DOTALL group that retries
+# a lookahead at every character of a long entry.
+_BRAIN_DUMP_RE = re.compile(r"##\s*Brain Dump\s*\n+", re.IGNORECASE)
+_PROMPTS_RE = re.compile(
+    r"##\s*(?:Daily Reflection|Reflection Questions|Reflection Prompts|Weekly Reflection)\s*\n+",
+    re.IGNORECASE,
+)
+_SECTION_END_RE = re.compile(r"\n(?:---|##)")
+_ENTRY_RE = re.compile(r"##\s*(?:MOST RECENT ENTRY|Earlier entry)\s*\(([^)]+)\):\n")
+_ENTRY_BOUNDARY_RE = re.compile(r"##\s*(?:MOST RECENT ENTRY|Earlier entry)")
+_PLACEHOLDER_RE = re.compile(r"\*Your thoughts, experiences, and observations\.\.\.\*")
+_BOLD_RE = re.compile(r"\*\*.*?\*\*")
+_RELATED_RE = re.compile(r"\*\*Related entries:\*\*.*$", re.DOTALL)
+_MEMORY_LINKS_RE = re.compile(r"##\s*Memory Links.*$", re.DOTALL)
+_WIKILINK_RE = re.compile(r"\[\[.*?\]\]")
+_HEADING_RE = re.compile(r"^#+.*$", re.MULTILINE)
+_MARKDOWN_RE = re.compile(r"[*_`>#\[\]|]+")
+_TAG_SPLIT_RE = re.compile(r"[:\n•\-]")
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+_DAY_REF_RE = re.compile(r"\[(Day [1-7])\]")
+_LIST_ITEM_RE = re.compile(r"^\s*(?:\d+[.)]?|[-*•][-*•\s]*)\s*(.+?)\s*$")
+
+_PROMPT_SKIP_PHRASES = (
+    "unresolved",
+    "worth exploring",
+    "here are",
+    "**",
+    "topics:",
+    "questions:",
+    "output format",
+)
+_TODO_SKIP_PHRASES = ("action items:", "tasks:", "todos:", "here are")
+_PROMPT_SKIP_RE = re.compile("|".join(map(re.escape, _PROMPT_SKIP_PHRASES)))
+_TODO_SKIP_RE = re.compile("|".join(map(re.escape, _TODO_SKIP_PHRASES)))
+
+
+class _TagTranslation(dict):
+    """str.translate table mapping every character outside [\\w\\s-] to '-', filled lazily per character."""
+
+    def __missing__(self, codepoint: int) -> int:
+        """Classify a character the first time it is seen and remember the mapping."""
+        char = chr(codepoint)
+        keep = char.isalnum() or char.isspace() or char in "_-"
+        self[codepoint] = codepoint if keep else ord("-")
+        return self[codepoint]
+
+
+_TAG_TRANSLATION = _TagTranslation()
+
+
+def _clean_tag(text: str) -> str:
+    """Lowercase and slugify a theme: punctuation becomes '-', with runs collapsed and ends trimmed."""
+    return "-".join(filter(None, text.lower().translate(_TAG_TRANSLATION).split("-")))
+
+
+def _find_section(header_re: re.Pattern, content: str) -> Optional[str]:
+    """Return the text after a section header up to the next `---` or `##` line."""
+    header = header_re.search(content)
+    if not header:
+        return None
+    end = _SECTION_END_RE.search(content, header.end())
+    return content[header.end():end.start() if end else len(content)]
+
+
+def _split_entries(text: str) -> List[Tuple[str, str]]:
+    """Split combined recent-entries text into (date, content) pairs."""
+    entries = []
+    pos = 0
+    while header := _ENTRY_RE.search(text, pos):
+        boundary = _ENTRY_BOUNDARY_RE.search(text, header.end())
+        if boundary:
+            end = boundary.start()
+        else:
+            end = len(text) - 1 if text.endswith("\n") else len(text)
+        entries.append((header.group(1), text[header.end():end]))
+        pos = end
+    return entries
+
+
+class _ThinkFilter:
+    """Drop <think>...</think> blocks from streamed text incrementally.
+
+    Only newly arrived text (plus a short overlap for tags split across
+    chunks) is searched for the next tag, so a long reasoning block costs
+    one pass instead of a rescan per chunk.
+    """
+
+    _OPEN = "<think>"
+    _CLOSE = "</think>"
+
+    def __init__(self):
+        self._in_think = False
+        self._pending = ""
+        self._think_parts: List[str] = []
+
+    def feed(self, chunk: str) -> str:
+        """Return the text of `chunk` that lies outside think blocks and is safe to parse now."""
+        text = self._pending + chunk
+        self._pending = ""
+        visible = []
+        while text:
+            if self._in_think:
+                end = text.find(self._CLOSE)
+                if end < 0:
+                    keep = len(self._CLOSE) - 1
+                    self._think_parts.append(text[:-keep])
+                    self._pending = text[-keep:]
+                    break
+                self._think_parts.clear()
+                text = text[end + len(self._CLOSE):]
+                self._in_think = False
+            else:
+                start = text.find(self._OPEN)
+                if start < 0:
+                    keep = next(
+                        (k for k in range(len(self._OPEN) - 1, 0, -1) if text.endswith(self._OPEN[:k])), 0
+                    )
+                    visible.append(text[:len(text) - keep])
+                    self._pending = text[len(text) - keep:]
+                    break
+                visible.append(text[:start])
+                text = text[start + len(self._OPEN):]
+                self._in_think = True
+        return "".join(visible)
+
+    def flush(self) -> str:
+        """Return held-back text at end of stream; an unclosed block is kept, as the regex would."""
+        if self._in_think:
+            return self._OPEN + "".join(self._think_parts) + self._pending
+        return self._pending
+
+
+_REFLECTION_PRIORITIES = """
+
+PRIORITY SYSTEM:
+1. PRIMARY: Day 1 (Today) - Prioritize today's writing heavily
+2. SECONDARY: Day 2 - Reference if there's a meaningful connection or ongoing pattern
+3. TERTIARY: Day 3+ - Reference only if it reveals important context
+4. PROMPTS: Previous questions - Reference only if genuinely unresolved"""
+
+_REFLECTION_RULES = """
+
+CRITICAL RULES:
+- STRONGLY prioritize Day 1 (today) - most questions should be about today's content
+- You MAY reference Day 2/3 if there's a genuinely important pattern, connection, or unresolved thread
+- MANDATORY: If ANY part of your question references content from a specific day (including Day 1), you MUST cite it using [Day X] format
+- When citing, add a brief reason in parentheses explaining WHY: (pattern, unresolved, connection to today, ongoing theme, etc.)
+- BUT: Don't ask follow-up questions about old topics just because they exist in the history
+- Use your judgment: Is this old topic still relevant? Did today's writing connect to it? Is there an unresolved question?
+- NEVER invent feelings, concerns, or problems they didn't express
+- Reference their actual words, ideas, observations, plans, or questions
+- Write questions that EXPAND on what they said, not assume negativity
+
+Good examples:
+"What do you think is contributing to your improved sleep metrics [Day 1] (mentioned today)?"
+"You mentioned Python community connections [Day 2] (ongoing theme) - how do you want to continue building on that?"
+"In light of your VS Code Dev Days experiences [Day 3] (recent learning), how might you apply those insights to your current work?"
+"I notice you raised concerns about work deadlines [Day 3] (unresolved question) but haven't mentioned them since - has that shifted?"
+
+Bad examples:
+"You mentioned feeling frustrated about X a few days ago..." (missing day citation and reason)
+"What's making you feel worried about..." (inventing a feeling)
+"Why are you concerned about..." (when they said "thinking about" not "concerned")
+"What skills from your recent experiences..." (referencing previous day but missing [Day X] citation)
+
+Output format - numbered questions with MANDATORY day citations and reasons:
+1. What connections do you see between X [Day 1] (reason) and...
+2. You mentioned X [Day 2] (reason) - how might you explore...
+3. In light of Y [Day 3] (reason), what would it look like if..."""
 
 
 class AnalysisEngine:
     """Handles AI-powered analysis of diary entries."""
 
     def __init__(self):
-        self._theme_cache = {}
+        self._theme_cache: OrderedDict[str, List[str]] = OrderedDict()
+        self._theme_store = ThemeCache(THEMES_DB)
+        self._sim_index: Deque[Tuple[int, List[str]]] = deque(maxlen=THEME_CACHE_SIZE)
+        self._ollama_slots = asyncio.Semaphore(OLLAMA_NUM_PARALLEL)
+        self._warmup_task: Optional[asyncio.Future] = None
+        self._signatures: Optional[Dict[str, dict]] = None
+        self._shingles_by_path: Dict[str, Tuple[Tuple[int, int], array]] = {}
+        self._lsh = LSHIndex(SIMILARITY_THRESHOLD)
+        self._last_scan: Dict[str, Tuple[int, int]] = {}
+        self._related_lock = threading.Lock()
+
+    async def warmup(self) -> None:
+        """Preload the Ollama model once per process so the first analysis doesn't pay the load time."""
+        if self._warmup_task is None:
+            self._warmup_task = asyncio.ensure_future(ollama_client.preload())
+        await self._warmup_task
 
     def _extract_brain_dump(self, content: str) -> str:
         """Extract the Brain Dump section which contains actual reflections (not prompts)."""
-        brain_dump_match = re.search(
-            r"##\s*Brain Dump\s*\n+(.*?)(?=\n---|\n##|\Z)",
-            content,
-            re.DOTALL | re.IGNORECASE,
-        )
+        brain_dump = _find_section(_BRAIN_DUMP_RE, content)
 
-        if brain_dump_match:
-            brain_dump = brain_dump_match.group(1).strip()
-            brain_dump = re.sub(
-                r"\*Your thoughts, experiences, and observations\.\.\.\*",
-                "",
-                brain_dump,
-            ).strip()
+        if brain_dump is not None:
+            brain_dump = brain_dump.strip()
+            brain_dump = _PLACEHOLDER_RE.sub("", brain_dump).strip()
             return brain_dump
 
         return ""
 
     def _extract_reflection_prompts(self, content: str) -> str:
         """Extract the reflection prompts section to identify unresolved questions."""
-        prompts_match = re.search(
-            r"##\s*(?:Daily Reflection|Reflection Questions|Reflection Prompts|Weekly Reflection)\s*\n+(.*?)(?=\n---|\n##|\Z)",
-            content,
-            re.DOTALL | re.IGNORECASE,
-        )
+        prompts = _find_section(_PROMPTS_RE, content)
 
-        if prompts_match:
-            prompts = prompts_match.group(1).strip()
-            prompts = re.sub(r"\*\*.*?\*\*", "", prompts)
+        if prompts is not None:
+            prompts = prompts.strip()
+            prompts = _BOLD_RE.sub("", prompts)
             return prompts
 
         return ""
 
+    def _strip_memory_links(self, content: str) -> str:
+        """Remove the generated links section so it doesn't skew analysis."""
+        content = _RELATED_RE.sub("", content)
+        return _MEMORY_LINKS_RE.sub("", content)
+
+    def _analysis_content(self, content: str) -> str:
+        """Return the Brain Dump if substantial, otherwise the entry without its links section."""
+        brain_dump = self._extract_brain_dump(content)
+        return brain_dump if len(brain_dump) > 50 else self._strip_memory_links(content)
+
+    def _shingles(self, content: str) -> Set[int]:
+        """Shingle the lowercased, markdown-stripped analysis content."""
+        text = self._analysis_content(content).lower()
+        text = _WIKILINK_RE.sub(" ", text)
+        text = _HEADING_RE.sub(" ", text)
+        text = _MARKDOWN_RE.sub(" ", text)
+        return shingles(text)
+
+    def _entry_shingles(self, file_path: Path, version: Tuple[int, int]) -> Optional[Set[int]]:
+        """Read and shingle an entry file, caching the hashes as a packed array for later comparisons."""
+        entry_content = entry_manager.read_entry(file_path)
+        if entry_content is None:
+            return None
+
+        entry_shingles = self._shingles(entry_content)
+        self._shingles_by_path[str(file_path)] = (version, array("Q", entry_shingles))
+        return entry_shingles
+
+    def _cached_shingles(self, file_path: Path, version: Tuple[int, int]) -> Optional[array]:
+        """Get an entry's shingle hashes, re-reading only when its (mtime_ns, size) changed."""
+        cached = self._shingles_by_path.get(str(file_path))
+        if cached is None or cached[0] != version:
+            if self._entry_shingles(file_path, version) is None:
+                return None
+            cached = self._shingles_by_path[str(file_path)]
+        return cached[1]
+
+    def _signature_store(self) -> Dict[str, dict]:
+        """Load the signature sidecar (path -> mtime, size + signature) on first use."""
+        if self._signatures is None:
+            try:
+                self._signatures = json.loads(SIGNATURES_FILE.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._signatures = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable signature cache: {e}")
+                self._signatures = {}
+        return self._signatures
+
+    def _save_signatures(self) -> None:
+        """Write the signature sidecar back to disk, logging rather than raising on failure."""
+        try:
+            SIGNATURES_FILE.parent.mkdir(parents=True, exist_ok=True)
+            SIGNATURES_FILE.write_text(json.dumps(self._signatures), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not save signature cache: {e}")
+
+    def _brain_dump_simhash(self, content: str) -> Optional[int]:
+        """SimHash of a substantial Brain Dump, or None when the entry is mostly template text."""
+        brain_dump = self._extract_brain_dump(content)
+        return simhash(brain_dump) if len(brain_dump) > 50 else None
+
+    def _near_duplicate_themes(self, content: str) -> Optional[List[str]]:
+        """Reuse themes of a previously analyzed Brain Dump whose SimHash is within NEAR_DUPLICATE_BITS."""
+        fingerprint = self._brain_dump_simhash(content)
+        if fingerprint is None:
+            return None
+        for other, themes in self._sim_index:
+            if (fingerprint ^ other).bit_count() <= NEAR_DUPLICATE_BITS:
+                return themes
+        return None
+
+    def _remember_themes(self, content: str, themes: List[str]) -> None:
+        """Index an entry's themes under its Brain Dump SimHash for near-duplicate reuse."""
+        if themes and (fingerprint := self._brain_dump_simhash(content)) is not None:
+            self._sim_index.append((fingerprint, themes))
+
     async def extract_themes_and_topics(self, content: str) -> List[str]:
         """Extract key themes from diary entry content, prioritizing Brain Dump section."""
         brain_dump = self._extract_brain_dump(content)
@@ -56,17 +325,17 @@ class AnalysisEngine:
             analysis_content = brain_dump
             logger.debug(f"Analyzing Brain Dump section ({len(brain_dump)} chars)")
         else:
-            analysis_content = re.sub(
-                r"\*\*Related entries:\*\*.*$", "", content, flags=re.DOTALL
-            )
-            analysis_content = re.sub(
-                r"##\s*Memory Links.*$", "", analysis_content, flags=re.DOTALL
-            )
+            analysis_content = self._strip_memory_links(content)
             logger.debug("No substantial Brain Dump found, analyzing full entry")
 
         if len(analysis_content.strip()) < 20:
             return []
 
+        near_duplicate = self._near_duplicate_themes(content)
+        if near_duplicate is not None:
+            logger.debug(f"Reusing themes from a near-duplicate entry: {near_duplicate}")
+            return near_duplicate
+
         prompt = f"""Analyze this journal entry and extract 3-5 key themes or topics.
 
 Entry content: {analysis_content}
@@ -89,19 +358,149 @@ friendship, work-stress, creativity"""
             theme.strip().lower()
             for theme in response_text.strip().split(",")
             if theme.strip()
-        ]
-        return themes[:5]
+        ][:5]
+        self._remember_themes(content, themes)
+        return themes
+
+    def _cached_themes(self, cache_key: str) -> Optional[List[str]]:
+        """Look up themes in the in-memory LRU, marking a hit as most recently used."""
+        themes = self._theme_cache.get(cache_key)
+        if themes is not None:
+            self._theme_cache.move_to_end(cache_key)
+        return themes
+
+    def _cache_themes(self, cache_key: str, themes: List[str]) -> List[str]:
+        """Store themes in the in-memory LRU, evicting the least recently used entry past THEME_CACHE_SIZE."""
+        self._theme_cache[cache_key] = themes
+        self._theme_cache.move_to_end(cache_key)
+        if len(self._theme_cache) > THEME_CACHE_SIZE:
+            self._theme_cache.popitem(last=False)
+        return themes
 
     async def get_themes_cached(self, content: str, file_stem: str) -> List[str]:
         """Get themes for content with caching to avoid redundant AI calls."""
-        cache_key = f"{file_stem}_{len(content)}_{hash(content[:100])}"
+        return (await self.get_themes_batch([(content, file_stem)]))[0]
 
-        if cache_key in self._theme_cache:
-            return self._theme_cache[cache_key]
+    async def get_themes_batch(self, items: List[Tuple[str, str]]) -> List[List[str]]:
+        """Get themes for many (content, file_stem) pairs, sending cache misses to Ollama in batches.
 
-        themes = await self.extract_themes_and_topics(content)
-        self._theme_cache[cache_key] = themes
-        return themes
+        Cache keys are content-addressed, so renamed or duplicated entries share
+        results; file_stem is only used for logging.
+        """
+        results: List[List[str]] = [[] for _ in items]
+        pending = []
+        misses = []
+
+        for i, (content, file_stem) in enumerate(items):
+            cache_key = hashlib.blake2b(
+                content.encode("utf-8", "ignore"), digest_size=16
+            ).hexdigest()
+            cached = self._cached_themes(cache_key)
+            if cached is not None:
+                results[i] = cached
+                continue
+
+            analysis_content = self._analysis_content(content)
+            content_hash = hashlib.blake2b(
+                analysis_content.encode("utf-8"), digest_size=16
+            ).hexdigest()
+            pending.append((i, cache_key, content_hash, content, analysis_content))
+
+        stored = self._theme_store.get_many([entry[2] for entry in pending])
+
+        for i, cache_key, content_hash, content, analysis_content in pending:
+            file_stem = items[i][1]
+            themes = stored.get(content_hash)
+
+            if themes is not None:
+                results[i] = self._cache_themes(cache_key, themes)
+                self._remember_themes(content, themes)
+            elif len(analysis_content.strip()) < 20:
+                results[i] = self._cache_themes(cache_key, [])
+            elif (themes := self._near_duplicate_themes(content)) is not None:
+                logger.debug(f"  Reusing near-duplicate themes for {file_stem}")
+                results[i] = self._cache_themes(cache_key, themes)
+            else:
+                logger.debug(f"  Theme cache miss: {file_stem}")
+                misses.append((i, cache_key, content_hash, content, analysis_content))
+
+        if not misses:
+            return results
+
+        batches = [[]]
+        batch_chars = 0
+        for miss in misses:
+            if batches[-1] and batch_chars + len(miss[4]) > THEME_BATCH_CHARS:
+                batches.append([])
+                batch_chars = 0
+            batches[-1].append(miss)
+            batch_chars += len(miss[4])
+
+        logger.debug(f"Theme cache: {len(items) - len(misses)} hits, {len(misses)} misses in {len(batches)} Ollama calls")
+        batch_results = await asyncio.gather(*[self._extract_themes_batch(batch) for batch in batches])
+
+        extracted = {}
+        for batch, themes_list in zip(batches, batch_results):
+            for (i, cache_key, content_hash, _, _), themes in zip(batch, themes_list):
+                if themes:
+                    extracted[content_hash] = themes
+                results[i] = self._cache_themes(cache_key, themes)
+        self._theme_store.set_many(extracted)
+
+        return results
+
+    async def _extract_themes_single(self, content: str) -> List[str]:
+        """Extract themes for one entry while holding an Ollama slot."""
+        async with self._ollama_slots:
+            return await self.extract_themes_and_topics(content)
+
+    async def _extract_themes_batch(self, batch: List[tuple]) -> List[List[str]]:
+        """Extract themes for several entries with one Ollama call, retrying unparsed ones individually."""
+        if len(batch) == 1:
+            return [await self._extract_themes_single(batch[0][3])]
+
+        entries_text = "\n---\n".join(
+            f"[ENTRY {i}]\n{miss[4]}" for i, miss in enumerate(batch)
+        )
+        prompt = f"""Analyze each journal entry below and extract 3-5 key themes or topics for each.
+
+{entries_text}
+
+Return ONLY JSON lines, one object per entry, with no other text:
+{{"id": 0, "themes": ["friendship", "work-stress", "creativity"]}}"""
+
+        try:
+            logger.debug(f"Extracting themes for {len(batch)} entries in one Ollama call...")
+            async with self._ollama_slots:
+                response_text = await ollama_client.generate(
+                    prompt,
+                    "You are an expert at identifying key themes in personal writing. Extract the most meaningful concepts.",
+                )
+        except Exception as e:
+            logger.error(f"Batch theme extraction failed: {e}")
+            return [[] for _ in batch]
+
+        parsed = {}
+        for line in _THINK_RE.sub("", response_text).splitlines():
+            line = line.strip().rstrip(",")
+            if not line.startswith("{"):
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            entry_id, themes = record.get("id"), record.get("themes")
+            if isinstance(entry_id, int) and 0 <= entry_id < len(batch) and isinstance(themes, list):
+                parsed[entry_id] = [str(t).strip().lower() for t in themes if str(t).strip()][:5]
+                self._remember_themes(batch[entry_id][3], parsed[entry_id])
+
+        missing = [i for i in range(len(batch)) if i not in parsed]
+        if missing:
+            logger.warning(f"Batch response missing {len(missing)} of {len(batch)} entries, extracting individually")
+            retried = await asyncio.gather(*[self._extract_themes_single(batch[i][3]) for i in missing])
+            parsed.update(zip(missing, retried))
+
+        return [parsed[i] for i in range(len(batch))]
 
     def generate_topic_tags(self, themes: List[str]) -> List[str]:
         """Convert themes to Obsidian-compatible topic tags."""
@@ -113,7 +512,7 @@ friendship, work-stress, creativity"""
 
         for theme in themes:
             if any(skip in theme.lower() for skip in ["key themes", "extracted from"]):
-                parts = re.split(r"[:\n•\-]", theme)
+                parts = _TAG_SPLIT_RE.split(theme)
                 for part in parts:
                     clean_part = part.strip()
                     if (
@@ -121,15 +520,11 @@ friendship, work-stress, creativity"""
                         and len(clean_part) < 50
                         and not any(skip in clean_part.lower() for skip in skip_phrases)
                     ):
-                        clean_theme = re.sub(
-                            r"[^\w\s-]+", "-", clean_part.lower()
-                        ).strip("-")
-                        clean_theme = re.sub(r"-+", "-", clean_theme)
+                        clean_theme = _clean_tag(clean_part)
                         if clean_theme:
                             topic_tags.append(f"#{clean_theme}")
             else:
-                clean_theme = re.sub(r"[^\w\s-]+", "-", theme.lower()).strip("-")
-                clean_theme = re.sub(r"-+", "-", clean_theme)
+                clean_theme = _clean_tag(theme)
                 if clean_theme:
                     topic_tags.append(f"#{clean_theme}")
 
@@ -142,73 +537,127 @@ friendship, work-stress, creativity"""
         max_related: int = 6,
         max_days_back: int = 30,
     ) -> List[str]:
-        """Find related entries using cached theme analysis (prioritizes Brain Dump content).
-        
+        """Find related entries by text overlap (prioritizes Brain Dump content).
+
+        MinHash signatures of each entry are banded into an LSH index to pick
+        candidates; exact shingle Jaccard is then computed only for those.
+
+        The scan reads files and computes signatures in pure Python, so it runs
+        in a worker thread to keep the event loop free for other requests.
+
         Args:
             current_content: Content to find related entries for
             exclude_date: Date to exclude from results (usually current entry date)
             max_related: Maximum number of related entries to return
             max_days_back: Only analyze entries from the last N days (default: 30)
         """
-        current_themes = set(
-            await self.get_themes_cached(current_content, exclude_date or "current")
+        return await asyncio.to_thread(
+            self._find_related_entries_locked, current_content, exclude_date, max_related, max_days_back
         )
 
-        if not current_themes:
-            logger.info("No themes extracted for current entry")
+    def _find_related_entries_locked(self, *args) -> List[str]:
+        """Run the blocking scan under a lock so concurrent calls don't interleave index updates."""
+        with self._related_lock:
+            return self._find_related_entries_sync(*args)
+
+    def _find_related_entries_sync(
+        self,
+        current_content: str,
+        exclude_date: Optional[str],
+        max_related: int,
+        max_days_back: int,
+    ) -> List[str]:
+        """Blocking body of find_related_entries: refresh the window's signatures and score LSH candidates."""
+        current_shingles = self._shingles(current_content)
+
+        if not current_shingles:
+            logger.info("Current entry has no content to compare")
             return []
 
         from datetime import datetime, timedelta
         cutoff_date = datetime.now() - timedelta(days=max_days_back)
         
-        all_entries = entry_manager.get_all_entries()
-        entries = [(date, path) for date, path in all_entries if date >= cutoff_date]
-        
-        similarity_scores = []
+        all_entries = entry_manager.get_all_entries_with_stats()
+        entries = [entry for entry in all_entries if entry[0] >= cutoff_date]
 
-        logger.info(
-            f"Finding related entries based on themes: {', '.join(sorted(current_themes))}"
-        )
+        logger.info(f"Finding related entries by text overlap ({len(current_shingles)} shingles)")
         logger.debug(f"Analyzing {len(entries)} entries from last {max_days_back} days (total: {len(all_entries)})")
 
-        for date, file_path in entries:
+        store = self._signature_store()
+        versions: Dict[str, Tuple[int, int]] = {}
+        updated = 0
+        dirty = False
+
+        present = {str(file_path) for _, file_path, _ in all_entries}
+        for key in [key for key in self._last_scan if key not in present]:
+            self._lsh.remove(key)
+            del self._last_scan[key]
+
+        for date, file_path, stat in entries:
             if exclude_date and file_path.stem == exclude_date:
                 logger.debug(f"  Skipping {file_path.stem} (excluded date)")
                 continue
 
-            entry_content = entry_manager.read_entry(file_path)
-            if entry_content.startswith("Error reading file"):
-                logger.debug(f"  Skipping {file_path.stem} (read error)")
+            key = str(file_path)
+            version = (stat.st_mtime_ns, stat.st_size)
+            versions[key] = version
+
+            if self._last_scan.get(key) == version:
                 continue
 
-            logger.debug(f"  Getting themes for {file_path.stem}...")
-            entry_themes = set(
-                await self.get_themes_cached(entry_content, file_path.stem)
-            )
-            logger.debug(
-                f"  Themes for {file_path.stem}: {sorted(entry_themes) if entry_themes else 'EMPTY'}"
-            )
+            cached = store.get(key)
+            if cached is None or (cached["mtime_ns"], cached.get("size")) != version:
+                entry_shingles = self._entry_shingles(file_path, version)
+                if entry_shingles is None:
+                    logger.debug(f"  Skipping {file_path.stem} (read error)")
+                    del versions[key]
+                    continue
 
-            if entry_themes:
-                intersection = current_themes & entry_themes
-                union = current_themes | entry_themes
-                similarity = len(intersection) / len(union)
+                cached = {"mtime_ns": version[0], "size": version[1], "signature": minhash(entry_shingles)}
+                store[key] = cached
+                dirty = True
+                logger.debug(f"  Signed {file_path.stem}")
 
-                logger.debug(
-                    f"  {file_path.stem}: themes={sorted(entry_themes)}, intersection={sorted(intersection)}, union={sorted(union)}, similarity={similarity:.3f}"
-                )
+            self._lsh.insert(key, cached["signature"])
+            self._last_scan[key] = version
+            updated += 1
 
-                if similarity > 0.08:
-                    similarity_scores.append((similarity, file_path.stem))
-                    logger.debug("    ✓ Above threshold (0.08), added to results")
-                else:
-                    logger.debug("    ✗ Below threshold (0.08), skipped")
+        if dirty:
+            self._save_signatures()
+
+        for key in [key for key in self._shingles_by_path if key not in versions]:
+            del self._shingles_by_path[key]
+
+        candidates = self._lsh.query(minhash(current_shingles)) & versions.keys()
+        logger.debug(f"LSH returned {len(candidates)} candidates ({len(self._lsh)} indexed, {updated} updated)")
+
+        vocabulary = ShingleVocabulary(current_shingles)
+        current_mask = vocabulary.mask(current_shingles)
+        current_count = len(current_shingles)
+
+        similarity_scores = []
+        for key in candidates:
+            file_path = Path(key)
+            entry_shingles = self._cached_shingles(file_path, versions[key])
+            if entry_shingles is None:
+                logger.debug(f"  Skipping {file_path.stem} (read error)")
+                continue
+
+            similarity = mask_jaccard(
+                current_mask, current_count, vocabulary.mask(entry_shingles), len(entry_shingles)
+            )
+            logger.debug(f"  {file_path.stem}: similarity={similarity:.3f}")
+
+            if similarity > SIMILARITY_THRESHOLD:
+                similarity_scores.append((similarity, file_path.stem))
+                logger.debug(f"    ✓ Above threshold ({SIMILARITY_THRESHOLD}), added to results")
             else:
-                logger.debug(f"  {file_path.stem}: No themes extracted")
+                logger.debug(f"    ✗ Below threshold ({SIMILARITY_THRESHOLD}), skipped")
 
-        similarity_scores.sort(reverse=True, key=lambda x: x[0])
+        # Stems are ISO dates, so equal scores fall back to newest-first.
+        top_scores = heapq.nlargest(max_related, similarity_scores)
 
-        backlinks = [f"[[{stem}]]" for _, stem in similarity_scores[:max_related]]
+        backlinks = [f"[[{stem}]]" for _, stem in top_scores]
 
         if backlinks:
             logger.info(f"✓ Found {len(backlinks)} cognitive connections")
@@ -227,6 +676,19 @@ friendship, work-stress, creativity"""
         is_sunday: bool = False,
     ) -> List[str]:
         """Generate reflection prompts based on recent content, prioritizing Brain Dump sections."""
+        return [
+            prompt
+            async for prompt in self.stream_reflection_prompts(recent_content, focus, count, is_sunday)
+        ]
+
+    async def stream_reflection_prompts(
+        self,
+        recent_content: str,
+        focus: Optional[str] = None,
+        count: int = 3,
+        is_sunday: bool = False,
+    ) -> AsyncIterator[str]:
+        """Yield reflection prompts as soon as each numbered line arrives from Ollama."""
         log_section(logger, "Generate Reflection Prompts")
         logger.info(
             f"Input: {len(recent_content):,} chars | Count: {count} | Sunday: {is_sunday} | Focus: {focus or 'None'}"
@@ -234,10 +696,9 @@ friendship, work-stress, creativity"""
 
         if len(recent_content.strip()) < 20:
             logger.warning("Content too short (<20 chars), returning empty")
-            return []
+            return
 
-        entry_pattern = re.compile(r"##\s*(?:MOST RECENT ENTRY|Earlier entry)\s*\(([^)]+)\):\n(.*?)(?=##\s*(?:MOST RECENT ENTRY|Earlier entry)|$)", re.DOTALL)
-        entry_matches = entry_pattern.findall(recent_content)
+        entry_matches = _split_entries(recent_content)
         
         date_map = {}
         entries = []
@@ -280,28 +741,24 @@ friendship, work-stress, creativity"""
                         prompt_parts.append(f"Day {i} prompts:\n{prompts}")
                         logger.debug(f"Day {i}: Extracted {len(prompts)} chars of reflection prompts")
                 
-                context_text = "\n\n".join(context_parts)
-                
+                parts = [
+                    "## PRIMARY FOCUS - Day 1 (Today):\n",
+                    most_recent_content,
+                    "\n\n## Historical Context (use for patterns/connections only):\n",
+                    "\n\n".join(context_parts),
+                ]
                 if prompt_parts:
-                    prompts_text = "\n\n".join(prompt_parts)
-                    analysis_content = f"""## PRIMARY FOCUS - Day 1 (Today):
-{most_recent_content}
-
-## Historical Context (use for patterns/connections only):
-{context_text}
-
-## Reflection Prompts from Previous Days (LOWEST PRIORITY - only reference if detecting unresolved thoughts):
-{prompts_text}"""
-                    logger.info(f"Total: {len(analysis_content):,} chars with hierarchical priority (Day 1 > Day 2 > Day 3 > Prompts)")
-                else:
-                    analysis_content = f"""## PRIMARY FOCUS - Day 1 (Today):
-{most_recent_content}
-
-## Historical Context (use for patterns/connections only):
-{context_text}"""
-                    logger.info(f"Total: {len(analysis_content):,} chars with hierarchical priority (Day 1 > Day 2 > Day 3)")
+                    parts.append(
+                        "\n\n## Reflection Prompts from Previous Days (LOWEST PRIORITY - only reference if detecting unresolved thoughts):\n"
+                    )
+                    parts.append("\n\n".join(prompt_parts))
+                analysis_content = "".join(parts)
+                logger.info(
+                    f"Total: {len(analysis_content):,} chars with hierarchical priority "
+                    f"(Day 1 > Day 2 > Day 3{' > Prompts' if prompt_parts else ''})"
+                )
             else:
-                analysis_content = f"## PRIMARY FOCUS - Day 1 (Today):\n{most_recent_content}"
+                analysis_content = "".join(["## PRIMARY FOCUS - Day 1 (Today):\n", most_recent_content])
                 logger.info(f"Single entry: {len(analysis_content):,} chars")
         else:
             brain_dump = self._extract_brain_dump(recent_content)
@@ -317,95 +774,93 @@ friendship, work-stress, creativity"""
             else ""
         )
 
-        prompt = f"""Generate {count} thoughtful reflection questions with a strong emphasis on what they wrote TODAY (Day 1).
-
-PRIORITY SYSTEM:
-1. PRIMARY: Day 1 (Today) - Prioritize today's writing heavily
-2. SECONDARY: Day 2 - Reference if there's a meaningful connection or ongoing pattern
-3. TERTIARY: Day 3+ - Reference only if it reveals important context
-4. PROMPTS: Previous questions - Reference only if genuinely unresolved{focus_instruction}{weekly_instruction}
-
-{analysis_content}
-
-CRITICAL RULES:
-- STRONGLY prioritize Day 1 (today) - most questions should be about today's content
-- You MAY reference Day 2/3 if there's a genuinely important pattern, connection, or unresolved thread
-- MANDATORY: If ANY part of your question references content from a specific day (including Day 1), you MUST cite it using [Day X] format
-- When citing, add a brief reason in parentheses explaining WHY: (pattern, unresolved, connection to today, ongoing theme, etc.)
-- BUT: Don't ask follow-up questions about old topics just because they exist in the history
-- Use your judgment: Is this old topic still relevant? Did today's writing connect to it? Is there an unresolved question?
-- NEVER invent feelings, concerns, or problems they didn't express
-- Reference their actual words, ideas, observations, plans, or questions
-- Write questions that EXPAND on what they said, not assume negativity
-
-Good examples:
-"What do you think is contributing to your improved sleep metrics [Day 1] (mentioned today)?"
-"You mentioned Python community connections [Day 2] (ongoing theme) - how do you want to continue building on that?"
-"In light of your VS Code Dev Days experiences [Day 3] (recent learning), how might you apply those insights to your current work?"
-"I notice you raised concerns about work deadlines [Day 3] (unresolved question) but haven't mentioned them since - has that shifted?"
-
-Bad examples:
-"You mentioned feeling frustrated about X a few days ago..." (missing day citation and reason)
-"What's making you feel worried about..." (inventing a feeling)
-"Why are you concerned about..." (when they said "thinking about" not "concerned")
-"What skills from your recent experiences..." (referencing previous day but missing [Day X] citation)
-
-Output format - numbered questions with MANDATORY day citations and reasons:
-1. What connections do you see between X [Day 1] (reason) and...
-2. You mentioned X [Day 2] (reason) - how might you explore...
-3. In light of Y [Day 3] (reason), what would it look like if..."""
+        prompt = "".join([
+            f"Generate {count} thoughtful reflection questions with a strong emphasis on what they wrote TODAY (Day 1).",
+            _REFLECTION_PRIORITIES,
+            focus_instruction,
+            weekly_instruction,
+            "\n\n",
+            analysis_content,
+            _REFLECTION_RULES,
+        ])
 
         logger.debug(f"Prompt size: {len(prompt):,} chars | Preview: {prompt[:100]}...")
 
+        logger.info("Streaming prompts from Ollama...")
+        response_parts = []
+        think_filter = _ThinkFilter()
+        buffer = ""
+        yielded = 0
         try:
-            logger.info("Calling Ollama API for prompt generation...")
-            response_text = await ollama_client.generate(
+            async with aclosing(ollama_client.generate_stream(
                 prompt,
                 "You are a thoughtful journaling coach. STRONGLY prioritize Day 1 (today's writing) for questions. You may reference previous days if there's a meaningful ongoing pattern or connection, but use discretion - don't resurrect old topics that aren't currently relevant. Never assume feelings or invent problems. Output ONLY numbered questions, nothing else.",
-            )
-            logger.info(f"Received response: {len(response_text)} chars")
-            logger.debug(f"Full response: {response_text}")
+            )) as stream:
+                async for chunk in stream:
+                    response_parts.append(chunk)
+                    buffer += think_filter.feed(chunk)
+                    *lines, buffer = buffer.split("\n")
+                    for line in lines:
+                        clean_prompt = self._parse_prompt_line(line, date_map)
+                        if clean_prompt:
+                            yield clean_prompt
+                            yielded += 1
+                            if yielded >= count:
+                                logger.debug(f"Full response: {''.join(response_parts)}")
+                                logger.info(f"✓ Extracted {yielded} prompts, stopped stream early")
+                                return
         except Exception as e:
             logger.error(f"Ollama call failed ({type(e).__name__}): {e}")
-            return []
+            return
 
-        logger.debug("Parsing prompts from response...")
+        logger.debug(f"Full response: {''.join(response_parts)}")
 
-        response_text = re.sub(
-            r"<think>.*?</think>", "", response_text, flags=re.DOTALL
-        )
+        for line in (buffer + think_filter.flush()).split("\n"):
+            clean_prompt = self._parse_prompt_line(line, date_map)
+            if clean_prompt and yielded < count:
+                yield clean_prompt
+                yielded += 1
 
-        skip_phrases = {
-            "unresolved",
-            "worth exploring",
-            "here are",
-            "**",
-            "topics:",
-            "questions:",
-            "output format",
-        }
-        prompts = []
-        for line in response_text.split("\n"):
-            line = line.strip()
-            if any(skip in line.lower() for skip in skip_phrases) or not line:
-                continue
+        logger.info(f"✓ Extracted {yielded} prompts")
 
-            if line and (line[0].isdigit() or line[0] == "-"):
-                clean_prompt = re.sub(r"^[\d.\-\s]+", "", line).strip()
-                if clean_prompt and (
-                    clean_prompt.endswith("?") or len(clean_prompt) > 20
-                ):
-                    for day_ref in ["Day 1", "Day 2", "Day 3", "Day 4", "Day 5", "Day 6", "Day 7"]:
-                        if day_ref in clean_prompt and day_ref in date_map:
-                            date_str = date_map[day_ref]
-                            clean_prompt = clean_prompt.replace(f"[{day_ref}]", f"[[{date_str}]]")
-                            logger.debug(f"  Converted [{day_ref}] to [[{date_str}]]")
-                    
-                    logger.debug(f"  ✓ {clean_prompt[:60]}...")
-                    prompts.append(clean_prompt)
+    def _parse_prompt_line(self, line: str, date_map: Dict[str, str]) -> Optional[str]:
+        """Return the cleaned question from a numbered response line, or None if it isn't one."""
+        match = _LIST_ITEM_RE.match(line)
+        if not match:
+            return None
+
+        clean_prompt = match.group(1)
+        if _PROMPT_SKIP_RE.search(clean_prompt.lower()):
+            return None
 
-        logger.info(f"✓ Extracted {len(prompts)} prompts (returning first {count})")
-        return prompts[:count]
+        if not (clean_prompt.endswith("?") or len(clean_prompt) > 20):
+            return None
+
+        if date_map:
+            clean_prompt = _DAY_REF_RE.sub(
+                lambda m: f"[[{date_map[m.group(1)]}]]" if m.group(1) in date_map else m.group(0),
+                clean_prompt,
+            )
+
+        logger.debug(f"  ✓ {clean_prompt[:60]}...")
+        return clean_prompt
+
+    async def analyze_entry_bundle(
+        self,
+        content: str,
+        exclude_date: Optional[str] = None,
+    ) -> Tuple[List[str], List[str]]:
+        """Extract themes and find related entries for one entry concurrently.
+
+        Returns (themes, related). The related-entries scan runs in a worker
+        thread, so it overlaps the theme request to Ollama instead of
+        delaying it.
+        """
+        themes, related = await asyncio.gather(
+            self._extract_themes_single(content),
+            self.find_related_entries(content, exclude_date=exclude_date),
+        )
+        return themes, related
 
     async def extract_todos(self, content: str) -> List[str]:
         """Extract action items and todos from diary entry content."""
@@ -458,17 +913,18 @@ IMPORTANT: Only output the bulleted list, no other text or commentary."""
 
         logger.debug("Parsing todos from response...")
         todos = []
-        skip_phrases = {"action items:", "tasks:", "todos:", "here are"}
         for line in response_text.split("\n"):
-            line = line.strip()
-            if any(skip in line.lower() for skip in skip_phrases):
+            match = _LIST_ITEM_RE.match(line)
+            if not match:
+                continue
+
+            clean_todo = match.group(1)
+            if _TODO_SKIP_RE.search(clean_todo.lower()):
                 continue
 
-            if line and line[0] in "-*•":
-                clean_todo = re.sub(r"^[-*•\s]+", "", line).strip()
-                if len(clean_todo) > 3:
-                    logger.debug(f"  ✓ {clean_todo[:60]}...")
-                    todos.append(clean_todo)
+            if len(clean_todo) > 3:
+                logger.debug(f"  ✓ {clean_todo[:60]}...")
+                todos.append(clean_todo)
 
         logger.info(f"✓ Extracted {len(todos)} action items")
         return todos
@@ -0,0 +1,63 @@
+"""Persistent theme cache backed by SQLite."""
+
+import json
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .logger import analysis_logger as logger
+
+_LOOKUP_CHUNK = 500
+
+
+class ThemeCache:
+    """Content-addressed store of extracted themes that survives restarts."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the shared connection on first use so importing never touches disk."""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS themes (content_hash TEXT PRIMARY KEY, themes TEXT NOT NULL)"
+            )
+        return self._conn
+
+    def get_many(self, content_hashes: Iterable[str]) -> Dict[str, List[str]]:
+        """Return cached themes for every hit among the given content hashes."""
+        hashes = list(dict.fromkeys(content_hashes))
+        found: Dict[str, List[str]] = {}
+        if not hashes:
+            return found
+        try:
+            conn = self._connection()
+            for start in range(0, len(hashes), _LOOKUP_CHUNK):
+                chunk = hashes[start:start + _LOOKUP_CHUNK]
+                rows = conn.execute(
+                    f"SELECT content_hash, themes FROM themes WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                found.update((content_hash, json.loads(themes)) for content_hash, themes in rows)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Theme cache read failed: {e}")
+        return found
+
+    def set_many(self, themes_by_hash: Dict[str, List[str]]) -> None:
+        """Store themes for several content hashes in one transaction."""
+        if not themes_by_hash:
+            return
+        try:
+            conn = self._connection()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO themes (content_hash, themes) VALUES (?, ?)",
+                    [(content_hash, json.dumps(themes)) for content_hash, themes in themes_by_hash.items()],
+                )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Theme cache write failed: {e}")
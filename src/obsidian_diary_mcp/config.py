@@ -24,9 +24,13 @@ print(f"[CONFIG] PLANNER_PATH: {planner_path_env}", file=sys.stderr)
 DIARY_PATH = Path(diary_path_env)
 PLANNER_PATH = Path(planner_path_env)
 RECENT_ENTRIES_COUNT = int(os.getenv("RECENT_ENTRIES_COUNT", "3"))
+CACHE_DIR = Path(os.getenv("CACHE_DIR", Path.home() / ".cache" / "obsidian_diary_mcp"))
+THEME_CACHE_SIZE = int(os.getenv("THEME_CACHE_SIZE", "4096"))
 
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:latest")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "60"))
 OLLAMA_TEMPERATURE = float(os.getenv("OLLAMA_TEMPERATURE", "0.7"))
-OLLAMA_NUM_PREDICT = int(os.getenv("OLLAMA_NUM_PREDICT", "1000"))
\ No newline at end of file
+OLLAMA_NUM_PREDICT = int(os.getenv("OLLAMA_NUM_PREDICT", "1000"))
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
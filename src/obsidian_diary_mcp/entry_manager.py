@@ -1,40 +1,63 @@
 """Entry management for diary files."""
 
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import re
 
 from .config import DIARY_PATH
+from .logger import entry_logger as logger
 
 
 class EntryManager:
     """Manages diary entry files and operations."""
     
+    _BACKLINK_PATTERNS = tuple(
+        re.compile(pattern, re.DOTALL | re.IGNORECASE)
+        for pattern in (
+            r"---\n\*\*(?:Related entries|Memory links):\*\*.*$",
+            r"---\s*##\s*Memory Links\s*\n+\*Temporal connections.*?\*",
+            r"---\s*##\s*Memory Links\s*\n+.*?(?=\n---|\Z)",
+        )
+    )
+    
     def __init__(self, diary_path: Path = DIARY_PATH):
         self.diary_path = diary_path
     
     def get_all_entries(self) -> List[Tuple[datetime, Path]]:
         """Get all diary entries sorted by date (newest first)."""
+        return [(date, path) for date, path, _ in self.get_all_entries_with_stats()]
+    
+    def get_all_entries_with_stats(self) -> List[Tuple[datetime, Path, os.stat_result]]:
+        """Get all diary entries with their stat results, sorted by date (newest first)."""
         entries = []
-        for file in self.diary_path.glob("*.md"):
-            if file.name.startswith("."):
+        try:
+            dir_entries = list(os.scandir(self.diary_path))
+        except OSError:
+            return entries
+        
+        for dir_entry in dir_entries:
+            name = dir_entry.name
+            if name.startswith(".") or not name.endswith(".md"):
                 continue
             try:
-                date_str = file.stem
-                date = datetime.strptime(date_str, "%Y-%m-%d")
-                entries.append((date, file))
-            except ValueError:
+                date = datetime.strptime(name[:-3], "%Y-%m-%d")
+                if not dir_entry.is_file():
+                    continue
+                entries.append((date, Path(dir_entry.path), dir_entry.stat()))
+            except (ValueError, OSError):
                 continue
         
         return sorted(entries, key=lambda x: x[0], reverse=True)
     
-    def read_entry(self, file_path: Path) -> str:
-        """Read the content of a diary entry file."""
+    def read_entry(self, file_path: Path) -> Optional[str]:
+        """Read the content of a diary entry file, or None if it can't be read."""
         try:
             return file_path.read_text(encoding="utf-8")
-        except (FileNotFoundError, PermissionError, OSError) as e:
-            return f"Error reading file: {e}"
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Could not read {file_path}: {e}")
+            return None
     
     def write_entry(self, file_path: Path, content: str) -> bool:
         """Write content to a diary entry file."""
@@ -58,14 +81,8 @@ class EntryManager:
     
     def remove_existing_backlinks(self, content: str) -> str:
         """Remove existing backlinks sections from content (including placeholder sections)."""
-        patterns = [
-            r"---\n\*\*(?:Related entries|Memory links):\*\*.*$",
-            r"---\s*##\s*Memory Links\s*\n+\*Temporal connections.*?\*",
-            r"---\s*##\s*Memory Links\s*\n+.*?(?=\n---|\Z)"
-        ]
-        
-        for pattern in patterns:
-            content = re.sub(pattern, "", content, flags=re.DOTALL | re.IGNORECASE)
+        for pattern in self._BACKLINK_PATTERNS:
+            content = pattern.sub("", content)
         
         return content.rstrip()
     
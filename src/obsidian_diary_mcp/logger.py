@@ -1,13 +1,31 @@
 """Logging configuration for the Obsidian Diary MCP server."""
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
-from datetime import datetime
 
 LOGS_DIR = Path(__file__).parent.parent.parent / "logs"
 LOGS_DIR.mkdir(exist_ok=True)
 
-DEBUG_LOG_FILE = LOGS_DIR / f"debug-{datetime.now().strftime('%Y-%m-%d')}.log"
+DEBUG_LOG_FILE = LOGS_DIR / "debug.log"
+
+_file_handler = TimedRotatingFileHandler(
+    DEBUG_LOG_FILE, when='midnight', backupCount=30, encoding='utf-8', delay=True
+)
+_file_handler.setLevel(logging.DEBUG)
+_file_handler.setFormatter(logging.Formatter(
+    '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
+    datefmt='%H:%M:%S'
+))
+
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+
+_log_listener = QueueListener(_log_queue, _file_handler, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 
 def setup_logger(name: str) -> logging.Logger:
@@ -18,17 +36,7 @@ def setup_logger(name: str) -> logging.Logger:
         return logger
     
     logger.setLevel(logging.DEBUG)
-    
-    file_handler = logging.FileHandler(DEBUG_LOG_FILE, mode='a', encoding='utf-8')
-    file_handler.setLevel(logging.DEBUG)
-    
-    formatter = logging.Formatter(
-        '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    file_handler.setFormatter(formatter)
-    
-    logger.addHandler(file_handler)
+    logger.addHandler(_queue_handler)
     
     logger.propagate = False
     
@@ -39,6 +47,7 @@ template_logger = setup_logger('template')
 analysis_logger = setup_logger('analysis')
 ollama_logger = setup_logger('ollama')
 server_logger = setup_logger('server')
+entry_logger = setup_logger('entry')
 
 
 def log_section(logger: logging.Logger, title: str):
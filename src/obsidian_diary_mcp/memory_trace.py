@@ -1,148 +1,189 @@
 """Generate comprehensive Memory Trace documents from diary entries."""
 
+import asyncio
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import List, Tuple, Dict
-from collections import Counter
+from typing import AsyncIterator, List, Tuple, Dict
+from collections import Counter, defaultdict
+from itertools import batched, chain, combinations, filterfalse
+from operator import itemgetter
+from statistics import fmean
 import re
 
+_CAPITALIZED_WORD_RE = re.compile(r'\b[A-Z][a-z]+\b')
+_HEADING_MARK_RE = re.compile(r'#+ ')
+_WIKILINK_RE = re.compile(r'\[\[.*?\]\]')
+_BOLD_LABEL_RE = re.compile(r'\*\*.*?\*\*:')
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_WORD_RE = re.compile(r"[a-z']+")
+
+_EXCLUDED_NAMES = frozenset({
+    'The', 'I', 'My', 'A', 'An', 'This', 'That', 'These', 'Those',
+    'When', 'Where', 'Why', 'How', 'What', 'Memory', 'Links', 'Brain', 'Dump',
+    'Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday',
+    'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+    'September', 'October', 'November', 'December',
+})
+_POSITIVE_WORDS = frozenset({
+    'great', 'good', 'excellent', 'amazing', 'wonderful', 'love', 'happy',
+    'excited', 'grateful', 'proud', 'success', 'achieved', 'progress', 'better',
+    'improved', 'growth', 'win',
+})
+_NEGATIVE_WORDS = frozenset({
+    'bad', 'terrible', 'awful', 'sad', 'angry', 'frustrated', 'worried',
+    'anxious', 'stressed', 'failed', 'struggling', 'difficult', 'hard', 'tired',
+    'exhausted',
+})
+_INSIGHT_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'"([^"]{20,150})"',  # Quoted text
+        r'learned that ([^.!?]{20,150})[.!?]',
+        r'realized ([^.!?]{20,150})[.!?]',
+        r'understood ([^.!?]{20,150})[.!?]',
+        r'important to ([^.!?]{20,150})[.!?]',
+    )
+]
+
+
+@dataclass(slots=True)
+class TraceEntry:
+    """A diary entry with its themes and the date strings the trace sections render."""
+    date: datetime
+    path: Path
+    content: str
+    date_str: str
+    long_date: str
+    month: str
+    year_month: str
+    weekday: str
+    themes: List[str] = field(default_factory=list)
+    snippets: Dict[int, str] = field(default_factory=dict)
+
 
 async def generate_memory_trace(
     entries: List[Tuple[datetime, Path]],
     analysis_engine,
     entry_manager
-) -> str:
-    """Generate a comprehensive memory trace document."""
+) -> AsyncIterator[str]:
+    """Generate a comprehensive memory trace document, yielding each section as soon as it is built.
     
-    sorted_entries = sorted(entries, key=lambda x: x[0])
+    Joining the yielded strings gives the complete markdown document.
+    """
+    
+    sorted_entries = sorted(entries, key=itemgetter(0))
     
     entry_data = []
-    all_themes = []
     
     print("Reading and analyzing entries...")
-    for date, path in sorted_entries:
-        content = entry_manager.read_entry(path)
-        if content.startswith("Error"):
+    contents = await asyncio.gather(
+        *[asyncio.to_thread(entry_manager.read_entry, path) for _, path in sorted_entries]
+    )
+    for (date, path), content in zip(sorted_entries, contents):
+        if content is None:
             continue
         
-        themes = await analysis_engine.get_themes_cached(content, path.stem)
-        entry_data.append({
-            'date': date,
-            'path': path,
-            'content': content,
-            'themes': themes
-        })
-        
-        all_themes.extend(themes)
+        entry_data.append(TraceEntry(
+            date=date,
+            path=path,
+            content=content,
+            date_str=date.strftime("%Y-%m-%d"),
+            long_date=date.strftime("%B %d, %Y"),
+            month=date.strftime("%B %Y"),
+            year_month=date.strftime("%Y-%m"),
+            weekday=date.strftime("%A"),
+        ))
+    
+    themes_list = await analysis_engine.get_themes_batch(
+        [(entry.content, entry.path.stem) for entry in entry_data]
+    )
+    theme_counts = Counter()
+    theme_index = defaultdict(list)
+    for entry, themes in zip(entry_data, themes_list):
+        entry.themes = themes
+        theme_counts.update(themes)
+        for theme in dict.fromkeys(themes):
+            theme_index[theme].append(entry)
     
     if not entry_data:
-        return "No valid entries found to analyze."
+        yield "No valid entries found to analyze."
+        return
     
     date_range_start = sorted_entries[0][0].strftime("%B %Y")
     date_range_end = sorted_entries[-1][0].strftime("%B %Y")
     today = datetime.now().strftime("%Y-%m-%d")
     
-    trace = []
-    
-    trace.append("# Memory Trace")
-    trace.append(f"*Generated: {today}*")
-    trace.append("")
-    trace.append(f"A visualization of themes, patterns, and connections across your diary entries from {date_range_start} to {date_range_end}.")
-    trace.append("")
-    trace.append("---")
-    trace.append("")
-    
-    timeline = await _generate_timeline_overview(entry_data, analysis_engine)
-    trace.append(timeline)
-    trace.append("")
-    
-    core_themes = await _generate_core_themes(entry_data, analysis_engine, entry_manager)
-    trace.append(core_themes)
-    trace.append("")
+    yield f"""# Memory Trace
+*Generated: {today}*
+
+A visualization of themes, patterns, and connections across your diary entries from {date_range_start} to {date_range_end}.
+
+---
+
+"""
     
-    patterns = _generate_recurring_patterns(entry_data, all_themes)
-    trace.append(patterns)
-    trace.append("")
+    yield await _generate_timeline_overview(entry_data, analysis_engine) + "\n\n"
+    yield await _generate_core_themes(entry_data, theme_counts, theme_index, analysis_engine, entry_manager) + "\n\n"
+    yield _generate_recurring_patterns(entry_data) + "\n\n"
     
     relationships = _generate_relationships_map(entry_data)
     if relationships:
-        trace.append(relationships)
-        trace.append("")
-    
-    growth = _generate_growth_trajectory(entry_data)
-    trace.append(growth)
-    trace.append("")
+        yield relationships + "\n\n"
     
-    wisdom = await _generate_wisdom_extracted(entry_data, analysis_engine)
-    trace.append(wisdom)
-    trace.append("")
+    yield _generate_growth_trajectory(entry_data) + "\n\n"
+    yield await _generate_wisdom_extracted(entry_data, analysis_engine) + "\n\n"
+    yield _generate_timeline_moments(entry_data) + "\n\n"
+    yield _generate_emotional_overview(entry_data) + "\n\n"
     
-    timeline_moments = _generate_timeline_moments(entry_data)
-    trace.append(timeline_moments)
-    trace.append("")
-    
-    emotional_overview = _generate_emotional_overview(entry_data)
-    trace.append(emotional_overview)
-    trace.append("")
-    
-    trace.append("---")
-    trace.append("")
-    trace.append("*This memory trace serves as a living document of your journey. Update it periodically to track your evolution.*")
-    
-    return "\n".join(trace)
+    yield """---
+
+*This memory trace serves as a living document of your journey. Update it periodically to track your evolution.*"""
+
+
+def _timeline_node(label: str, themes_str: str, indent: str) -> str:
+    """Render one timeline step: the label, a connector arrow, then its themes."""
+    return f"{label}\n{indent}│\n{indent}▼\n{themes_str}"
 
 
-async def _generate_timeline_overview(entry_data: List[Dict], analysis_engine) -> str:
+async def _generate_timeline_overview(entry_data: List[TraceEntry], analysis_engine) -> str:
     """Generate ASCII timeline with key themes."""
-    timeline = ["## Timeline Overview", ""]
-    
     if len(entry_data) <= 10:
-        timeline.append("```")
-        for i, entry in enumerate(entry_data):
-            date_str = entry['date'].strftime("%Y-%m-%d")
-            themes_str = " & ".join(entry['themes'][:2]) if entry['themes'] else "Reflection"
-            
-            timeline.append(f"{date_str} ─────► " if i < len(entry_data) - 1 else date_str)
-            timeline.extend(["   │", "   ▼", themes_str])
-            if i < len(entry_data) - 1:
-                timeline.extend(["   │", ""])
-        timeline.append("```")
+        indent = "\xa0\xa0\xa0"
+        last = len(entry_data) - 1
+        nodes = (
+            _timeline_node(
+                f"{entry.date_str} ─────► " if i < last else entry.date_str,
+                " & ".join(entry.themes[:2]) if entry.themes else "Reflection",
+                indent,
+            )
+            for i, entry in enumerate(entry_data)
+        )
     else:
-        timeline.append("```")
+        indent = "   "
         key_indices = [0, len(entry_data)//3, 2*len(entry_data)//3, len(entry_data)-1]
-        
-        for i, idx in enumerate(key_indices):
-            entry = entry_data[idx]
-            date_str = entry['date'].strftime("%Y-%m-%d")
-            themes_str = " & ".join(entry['themes'][:2]) if entry['themes'] else "Reflection"
-            
-            if i < len(key_indices) - 1:
-                timeline.append(f"{date_str} ─────► {key_indices[i+1] - idx} entries ─────► ")
-            else:
-                timeline.append(date_str)
-            timeline.append("   │")
-            timeline.append("   ▼")
-            timeline.append(themes_str.title())
-            if i < len(key_indices) - 1:
-                timeline.append("   │")
-                timeline.append("")
-        timeline.append("```")
-    
-    timeline.append("")
-    timeline.append("---")
-    
-    return "\n".join(timeline)
+        last = len(key_indices) - 1
+        nodes = (
+            _timeline_node(
+                f"{entry_data[idx].date_str} ─────► {key_indices[i+1] - idx} entries ─────► "
+                if i < last else entry_data[idx].date_str,
+                (" & ".join(entry_data[idx].themes[:2]) if entry_data[idx].themes else "Reflection").title(),
+                indent,
+            )
+            for i, idx in enumerate(key_indices)
+        )
+    
+    return "## Timeline Overview\n\n```\n" + f"\n{indent}│\n\n".join(nodes) + "\n```\n\n---"
 
 
-async def _generate_core_themes(entry_data: List[Dict], analysis_engine, entry_manager) -> str:
+async def _generate_core_themes(
+    entry_data: List[TraceEntry],
+    theme_counts: Counter,
+    theme_index: Dict[str, List[TraceEntry]],
+    analysis_engine,
+    entry_manager
+) -> str:
     """Generate core themes section with evolution."""
-    themes_section = ["## Core Themes", ""]
-    
-    all_themes = []
-    for entry in entry_data:
-        all_themes.extend(entry['themes'])
-    
-    theme_counts = Counter(all_themes)
     top_themes = theme_counts.most_common(8)
     
     if not top_themes:
@@ -150,282 +191,224 @@ async def _generate_core_themes(entry_data: List[Dict], analysis_engine, entry_m
     
     print(f"🎯 Analyzing top {len(top_themes)} themes in detail...")
     
+    blocks = []
     for theme, count in top_themes:
-        theme_entries = [e for e in entry_data if theme in e['themes']]
+        theme_entries = theme_index.get(theme)
         
         if not theme_entries:
             continue
         
-        first_date = theme_entries[0]['date'].strftime("%B %Y")
-        last_date = theme_entries[-1]['date'].strftime("%B %Y")
+        first_date = theme_entries[0].month
+        last_date = theme_entries[-1].month
         
         percentage = (count / len(entry_data)) * 100
         
-        emoji = _get_theme_emoji(theme)
-        themes_section.append(f"### {emoji} {theme.title().replace('-', ' ')}")
-        themes_section.append(f"**Frequency:** {count} entries ({percentage:.0f}% of period) | **Active:** {first_date} → {last_date}")
-        themes_section.append("")
-        
         if len(theme_entries) >= 3:
             early_entry = theme_entries[0]
             mid_entry = theme_entries[len(theme_entries)//2]
             late_entry = theme_entries[-1]
             
-            themes_section.append(f"**Early ({early_entry['date'].strftime('%B %Y')})**: {_extract_snippet(early_entry['content'], 100)}")
-            themes_section.append("")
-            themes_section.append(f"**Middle ({mid_entry['date'].strftime('%B %Y')})**: {_extract_snippet(mid_entry['content'], 100)}")
-            themes_section.append("")
-            themes_section.append(f"**Recent ({late_entry['date'].strftime('%B %Y')})**: {_extract_snippet(late_entry['content'], 100)}")
-            themes_section.append("")
+            evolution = (
+                f"**Early ({early_entry.month})**: {_entry_snippet(early_entry, 100)}\n\n"
+                f"**Middle ({mid_entry.month})**: {_entry_snippet(mid_entry, 100)}\n\n"
+                f"**Recent ({late_entry.month})**: {_entry_snippet(late_entry, 100)}"
+            )
         else:
-            latest = theme_entries[-1]
-            themes_section.append(f"**Context:** {_extract_snippet(latest['content'], 150)}")
-            themes_section.append("")
+            evolution = f"**Context:** {_entry_snippet(theme_entries[-1], 150)}"
         
-        themes_section.append("")
+        blocks.append(
+            f"### {_get_theme_emoji(theme)} {theme.title().replace('-', ' ')}\n"
+            f"**Frequency:** {count} entries ({percentage:.0f}% of period) | **Active:** {first_date} → {last_date}\n\n"
+            f"{evolution}\n\n\n"
+        )
     
-    themes_section.append("---")
-    
-    return "\n".join(themes_section)
+    return "## Core Themes\n\n" + "".join(blocks) + "---"
 
 
-def _generate_recurring_patterns(entry_data: List[Dict], all_themes: List[str]) -> str:
+def _generate_recurring_patterns(entry_data: List[TraceEntry]) -> str:
     """Identify recurring patterns and cycles."""
-    patterns_section = ["## Recurring Patterns", ""]
+    patterns_section = "## Recurring Patterns\n\n"
     
     theme_pairs = Counter()
     for entry in entry_data:
-        themes = entry['themes']
-        for i, theme1 in enumerate(themes):
-            for theme2 in themes[i+1:]:
-                pair = tuple(sorted([theme1, theme2]))
-                theme_pairs[pair] += 1
+        theme_pairs.update(combinations(sorted(set(entry.themes)), 2))
     
     common_pairs = theme_pairs.most_common(5)
     
     if common_pairs:
-        patterns_section.append("### 🔄 Theme Connections")
-        patterns_section.append("")
-        for (theme1, theme2), count in common_pairs:
-            patterns_section.append(f"- **{theme1.replace('-', ' ').title()}** ↔ **{theme2.replace('-', ' ').title()}** (co-occurred {count}× times)")
-        patterns_section.append("")
+        connections = "".join(
+            f"- **{theme1.replace('-', ' ').title()}** ↔ **{theme2.replace('-', ' ').title()}** (co-occurred {count}× times)\n"
+            for (theme1, theme2), count in common_pairs
+        )
+        patterns_section += f"### 🔄 Theme Connections\n\n{connections}\n"
     
-    day_themes = {}
+    day_themes = defaultdict(Counter)
     for entry in entry_data:
-        day = entry['date'].strftime("%A")
-        if day not in day_themes:
-            day_themes[day] = []
-        day_themes[day].extend(entry['themes'])
+        day_themes[entry.weekday].update(entry.themes)
     
     if len(day_themes) >= 3:
-        patterns_section.append("### 📅 Temporal Patterns")
-        patterns_section.append("")
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-            if day in day_themes and day_themes[day]:
-                top_day_themes = Counter(day_themes[day]).most_common(2)
-                themes_str = ", ".join([t[0].replace('-', ' ') for t in top_day_themes])
-                patterns_section.append(f"- **{day}s**: {themes_str}")
-        patterns_section.append("")
-    
-    patterns_section.append("---")
-    
-    return "\n".join(patterns_section)
+        temporal = "".join(
+            f"- **{day}s**: {', '.join([t[0].replace('-', ' ') for t in day_themes[day].most_common(2)])}\n"
+            for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+            if day_themes.get(day)
+        )
+        patterns_section += f"### 📅 Temporal Patterns\n\n{temporal}\n"
+    
+    return patterns_section + "---"
 
 
-def _generate_relationships_map(entry_data: List[Dict]) -> str:
+def _generate_relationships_map(entry_data: List[TraceEntry]) -> str:
     """Generate relationship map if people are mentioned."""
-    exclude_words = {'The', 'I', 'My', 'A', 'An', 'This', 'That', 'These', 'Those', 
-                     'When', 'Where', 'Why', 'How', 'What', 'Memory', 'Links', 'Brain', 'Dump', 
-                     'Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday',
-                     'January', 'February', 'March', 'April', 'May', 'June', 'July', 'August', 
-                     'September', 'October', 'November', 'December'}
-    
-    potential_names = Counter()
-    
-    for entry in entry_data:
-        words = re.findall(r'\b[A-Z][a-z]+\b', entry['content'])
-        potential_names.update(w for w in words if w not in exclude_words)
+    words = _CAPITALIZED_WORD_RE.findall("\n".join(entry.content for entry in entry_data))
+    potential_names = Counter(filterfalse(_EXCLUDED_NAMES.__contains__, words))
     
     significant_names = [(name, count) for name, count in potential_names.most_common(10) if count >= 3]
     
     if not significant_names or len(significant_names) < 2:
         return ""
     
-    relationships = ["## Key Relationships Map", ""]
-    relationships.append("```")
-    relationships.append("        YOUR NETWORK")
-    relationships.append("              │")
-    relationships.append("    ┌─────────┴─────────┐")
-    
-    high_freq = [n for n, c in significant_names if c >= len(entry_data) * 0.3]
-    med_freq = [n for n, c in significant_names if len(entry_data) * 0.1 <= c < len(entry_data) * 0.3]
-    
+    high_threshold = len(entry_data) * 0.3
+    med_threshold = len(entry_data) * 0.1
+    high_freq = []
+    med_freq = []
+    for name, count in significant_names:
+        if count >= high_threshold:
+            high_freq.append((name, count))
+        elif count >= med_threshold:
+            med_freq.append((name, count))
+    
+    network = ""
     if high_freq:
-        relationships.append("    │                 │")
-        relationships.append(" Close Circle    Extended Network")
-        for name in high_freq[:3]:
-            count = potential_names[name]
-            relationships.append(f"   {name} ({count}×)")
+        network += "    │                 │\n Close Circle    Extended Network\n"
+        network += "".join(f"   {name} ({count}×)\n" for name, count in high_freq[:3])
     
     if med_freq:
-        relationships.append("                     │")
-        for name in med_freq[:4]:
-            count = potential_names[name]
-            relationships.append(f"                  {name} ({count}×)")
+        network += "                     │\n"
+        network += "".join(f"                  {name} ({count}×)\n" for name, count in med_freq[:4])
     
-    relationships.append("```")
-    relationships.append("")
-    relationships.append("---")
-    
-    return "\n".join(relationships)
+    return f"""## Key Relationships Map
+
+```
+        YOUR NETWORK
+              │
+    ┌─────────┴─────────┐
+{network}```
+
+---"""
+
+
+def _trajectory_arrow(score: float) -> str:
+    """Map a sentiment score to the arrow shown in the growth trajectory."""
+    if score > 0.2:
+        return "↗ ↗ ↗"
+    if score > 0:
+        return "↗"
+    if score < -0.2:
+        return "↘ ↘"
+    if score < 0:
+        return "↘"
+    return "→"
 
 
-def _generate_growth_trajectory(entry_data: List[Dict]) -> str:
+def _sentiment_score(content: str) -> float:
+    """Balance of positive vs negative words, from -1 (all negative) to 1 (all positive)."""
+    word_counts = Counter(_WORD_RE.findall(content.lower()))
+    positive_count = sum(map(word_counts.__getitem__, _POSITIVE_WORDS))
+    negative_count = sum(map(word_counts.__getitem__, _NEGATIVE_WORDS))
+    
+    total = positive_count + negative_count
+    return (positive_count - negative_count) / total if total > 0 else 0
+
+
+def _generate_growth_trajectory(entry_data: List[TraceEntry]) -> str:
     """Generate growth trajectory visualization."""
-    growth = ["## Growth Trajectory", ""]
-    
-    positive_words = {'great', 'good', 'excellent', 'amazing', 'wonderful', 'love', 'happy', 
-                      'excited', 'grateful', 'proud', 'success', 'achieved', 'progress', 'better', 
-                      'improved', 'growth', 'win'}
-    negative_words = {'bad', 'terrible', 'awful', 'sad', 'angry', 'frustrated', 'worried', 
-                      'anxious', 'stressed', 'failed', 'struggling', 'difficult', 'hard', 'tired', 
-                      'exhausted'}
-    
-    sentiment_scores = []
-    for entry in entry_data:
-        content_lower = entry['content'].lower()
-        positive_count = sum(1 for word in positive_words if word in content_lower)
-        negative_count = sum(1 for word in negative_words if word in content_lower)
-        
-        total = positive_count + negative_count
-        score = (positive_count - negative_count) / total if total > 0 else 0
-        
-        sentiment_scores.append(score)
-    
-    growth.append("```")
+    sentiment_scores = [_sentiment_score(entry.content) for entry in entry_data]
     
     segment_size = max(1, len(sentiment_scores) // 5)
-    segments = []
-    for i in range(0, len(sentiment_scores), segment_size):
-        segment = sentiment_scores[i:i+segment_size]
-        avg = sum(segment) / len(segment) if segment else 0
-        segments.append(avg)
-    
-    for i, score in enumerate(segments):
-        date = entry_data[i * segment_size]['date'].strftime("%Y-%m")
-        
-        if score > 0.2:
-            arrow = "↗ ↗ ↗"
-        elif score > 0:
-            arrow = "↗"
-        elif score < -0.2:
-            arrow = "↘ ↘"
-        elif score < 0:
-            arrow = "↘"
-        else:
-            arrow = "→"
-        
-        if i < len(segments) - 1:
-            growth.append(f"{date} ─────► ")
-        else:
-            growth.append(f"{date}")
-        growth.append(f"  {arrow}")
+    segments = [fmean(segment) for segment in batched(sentiment_scores, segment_size)]
     
-    growth.append("")
-    growth.append("Legend: ↗ = positive trajectory, → = stable, ↘ = challenges")
-    growth.append("```")
-    growth.append("")
-    growth.append("---")
+    last = len(segments) - 1
+    trajectory = "".join(
+        f"{entry_data[i * segment_size].year_month}{' ─────► ' if i < last else ''}\n  {_trajectory_arrow(score)}\n"
+        for i, score in enumerate(segments)
+    )
     
-    return "\n".join(growth)
+    return f"""## Growth Trajectory
 
+```
+{trajectory}
+Legend: ↗ = positive trajectory, → = stable, ↘ = challenges
+```
 
-async def _generate_wisdom_extracted(entry_data: List[Dict], analysis_engine) -> str:
+---"""
+
+
+async def _generate_wisdom_extracted(entry_data: List[TraceEntry], analysis_engine) -> str:
     """Extract key insights and wisdom."""
-    wisdom = ["## Wisdom Extracted", ""]
-    wisdom.append("Key insights discovered throughout your entries:")
-    wisdom.append("")
-    
-    insight_patterns = [
-        r'"([^"]{20,150})"',  # Quoted text
-        r'learned that ([^.!?]{20,150})[.!?]',
-        r'realized ([^.!?]{20,150})[.!?]',
-        r'understood ([^.!?]{20,150})[.!?]',
-        r'important to ([^.!?]{20,150})[.!?]',
-    ]
-    
     insights = []
+    seen = set()
     for entry in entry_data:
-        content = entry['content']
-        for pattern in insight_patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            for match in matches:
-                insight = match.group(1).strip()
-                if len(insight) >= 20 and insight not in insights:
-                    insights.append(insight)
-                    if len(insights) >= 8:
-                        break
-            if len(insights) >= 8:
-                break
+        # Each pattern scans independently so insights nested in another match are kept.
+        for match in chain.from_iterable(pattern.finditer(entry.content) for pattern in _INSIGHT_PATTERNS):
+            insight = match.group(1).strip()
+            if len(insight) >= 20 and insight not in seen:
+                seen.add(insight)
+                insights.append(insight)
+                if len(insights) >= 8:
+                    break
         if len(insights) >= 8:
             break
     
     if insights:
-        for insight in insights[:8]:
-            wisdom.append(f"> {insight}")
-            wisdom.append("")
+        body = "".join(f"> {insight}\n\n" for insight in insights[:8])
     else:
-        wisdom.append("*Wisdom accumulates with each entry. Continue your practice to surface deeper insights.*")
-        wisdom.append("")
-    
-    wisdom.append("---")
+        body = "*Wisdom accumulates with each entry. Continue your practice to surface deeper insights.*\n\n"
     
-    return "\n".join(wisdom)
+    return f"## Wisdom Extracted\n\nKey insights discovered throughout your entries:\n\n{body}---"
 
 
-def _generate_timeline_moments(entry_data: List[Dict]) -> str:
+def _generate_timeline_moments(entry_data: List[TraceEntry]) -> str:
     """Generate timeline of significant moments."""
-    timeline = ["## Timeline of Significant Moments", ""]
-    
     key_entries = entry_data if len(entry_data) <= 5 else [entry_data[i] for i in [0, len(entry_data)//4, len(entry_data)//2, 3*len(entry_data)//4, len(entry_data)-1]]
     
-    for entry in key_entries:
-        date_str = entry['date'].strftime("%B %d, %Y")
-        themes_str = (", ".join(entry['themes'][:3]) if entry['themes'] else "reflection").title().replace('-', ' ')
-        snippet = _extract_snippet(entry['content'], 80)
-        
-        timeline.extend([f"**{date_str}** - {themes_str}", f"  ↳ {snippet}", ""])
-    
-    timeline.append("---")
+    body = "".join(
+        f"**{entry.long_date}** - "
+        f"{(', '.join(entry.themes[:3]) if entry.themes else 'reflection').title().replace('-', ' ')}\n"
+        f"  ↳ {_entry_snippet(entry, 80)}\n\n"
+        for entry in key_entries
+    )
     
-    return "\n".join(timeline)
+    return f"## Timeline of Significant Moments\n\n{body}---"
 
 
-def _generate_emotional_overview(entry_data: List[Dict]) -> str:
+def _generate_emotional_overview(entry_data: List[TraceEntry]) -> str:
     """Generate quick reference of entry tones."""
-    overview = ["## Quick Reference: Entry Overview", ""]
-    
-    overview.extend(
-        f"- **{entry['date'].strftime('%Y-%m-%d')}**: {(', '.join(entry['themes'][:2]) if entry['themes'] else 'general reflection').replace('-', ' ')}"
+    body = "\n".join(
+        f"- **{entry.date_str}**: {(', '.join(entry.themes[:2]) if entry.themes else 'general reflection').replace('-', ' ')}"
         for entry in entry_data[-15:]
     )
     
     if len(entry_data) > 15:
-        overview.extend(["", f"*...and {len(entry_data) - 15} earlier entries*"])
-    
-    overview.append("")
-    overview.append("---")
+        body += f"\n\n*...and {len(entry_data) - 15} earlier entries*"
     
-    return "\n".join(overview)
+    return f"## Quick Reference: Entry Overview\n\n{body}\n\n---"
+
+
+def _entry_snippet(entry: TraceEntry, max_length: int) -> str:
+    """Snippet of an entry, memoized on the entry so the memo lives only as long as the trace."""
+    snippet = entry.snippets.get(max_length)
+    if snippet is None:
+        snippet = entry.snippets[max_length] = _extract_snippet(entry.content, max_length)
+    return snippet
 
 
 def _extract_snippet(content: str, max_length: int = 100) -> str:
     """Extract a meaningful snippet from content."""
-    clean = re.sub(r'#+ ', '', content)
-    clean = re.sub(r'\[\[.*?\]\]', '', clean)
-    clean = re.sub(r'\*\*.*?\*\*:', '', clean)
+    clean = _HEADING_MARK_RE.sub('', content)
+    clean = _WIKILINK_RE.sub('', clean)
+    clean = _BOLD_LABEL_RE.sub('', clean)
     
-    sentences = re.split(r'[.!?]+', clean)
+    sentences = _SENTENCE_END_RE.split(clean)
     for sentence in sentences:
         sentence = sentence.strip()
         if len(sentence) >= 20:
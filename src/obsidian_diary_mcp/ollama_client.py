@@ -1,7 +1,10 @@
 """Ollama API client for text generation."""
 
+import json
+from typing import AsyncIterator
+
 import httpx
-from .config import OLLAMA_URL, OLLAMA_MODEL, OLLAMA_TIMEOUT, OLLAMA_TEMPERATURE, OLLAMA_NUM_PREDICT
+from .config import OLLAMA_URL, OLLAMA_MODEL, OLLAMA_TIMEOUT, OLLAMA_TEMPERATURE, OLLAMA_NUM_PREDICT, OLLAMA_KEEP_ALIVE
 from .logger import ollama_logger as logger, log_section
 
 
@@ -13,6 +16,19 @@ class OllamaClient:
         self.model = OLLAMA_MODEL
         self.timeout = OLLAMA_TIMEOUT
     
+    def _payload(self, prompt: str, system_prompt: str, stream: bool) -> dict:
+        """Build the /api/generate request body shared by generate and generate_stream."""
+        return {
+            "model": self.model,
+            "prompt": f"{system_prompt}\n\n{prompt}",
+            "stream": stream,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "options": {
+                "temperature": OLLAMA_TEMPERATURE,
+                "num_predict": OLLAMA_NUM_PREDICT,
+            }
+        }
+    
     async def generate(self, prompt: str, system_prompt: str = "") -> str:
         """Generate text using Ollama API."""
         log_section(logger, "Ollama API Call")
@@ -25,15 +41,7 @@ class OllamaClient:
                 logger.info("Sending request to Ollama...")
                 response = await client.post(
                     f"{self.url}/api/generate",
-                    json={
-                        "model": self.model,
-                        "prompt": f"{system_prompt}\n\n{prompt}",
-                        "stream": False,
-                        "options": {
-                            "temperature": OLLAMA_TEMPERATURE,
-                            "num_predict": OLLAMA_NUM_PREDICT,
-                        }
-                    },
+                    json=self._payload(prompt, system_prompt, stream=False),
                     timeout=self.timeout
                 )
                 logger.debug(f"Response status: {response.status_code}")
@@ -52,6 +60,63 @@ class OllamaClient:
                 logger.error(f"Request failed ({type(e).__name__}): {e}")
                 raise
     
+    async def generate_stream(self, prompt: str, system_prompt: str = "") -> AsyncIterator[str]:
+        """Generate text using Ollama API, yielding response chunks as they arrive."""
+        log_section(logger, "Ollama API Call (streaming)")
+        logger.debug(f"Endpoint: {self.url}/api/generate")
+        logger.debug(f"Model: {self.model} | Timeout: {self.timeout}s | Temp: {OLLAMA_TEMPERATURE}")
+        logger.debug(f"Prompt size: system={len(system_prompt)} chars, user={len(prompt):,} chars")
+        
+        async with httpx.AsyncClient() as client:
+            try:
+                logger.info("Sending streaming request to Ollama...")
+                async with client.stream(
+                    "POST",
+                    f"{self.url}/api/generate",
+                    json=self._payload(prompt, system_prompt, stream=True),
+                    timeout=self.timeout
+                ) as response:
+                    logger.debug(f"Response status: {response.status_code}")
+                    response.raise_for_status()
+                    received = 0
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        text = chunk.get("response", "")
+                        if text:
+                            received += len(text)
+                            yield text
+                        if chunk.get("done"):
+                            break
+                    logger.info(f"✓ Streamed {received:,} chars from Ollama")
+            except httpx.TimeoutException as e:
+                logger.error(f"Timeout after {self.timeout}s: {e}")
+                raise
+            except httpx.HTTPStatusError as e:
+                logger.error(f"HTTP error {e.response.status_code}: {e}")
+                raise
+            except Exception as e:
+                logger.error(f"Request failed ({type(e).__name__}): {e}")
+                raise
+    
+    async def preload(self) -> bool:
+        """Load the model into memory without generating, so the first real call skips the load."""
+        logger.info(f"Preloading model {self.model} (keep_alive={OLLAMA_KEEP_ALIVE})...")
+        async with httpx.AsyncClient() as client:
+            try:
+                response = await client.post(
+                    f"{self.url}/api/generate",
+                    json={"model": self.model, "keep_alive": OLLAMA_KEEP_ALIVE},
+                    timeout=self.timeout
+                )
+                response.raise_for_status()
+                logger.info("✓ Model preloaded")
+                return True
+            except Exception as e:
+                logger.warning(f"Model preload failed ({type(e).__name__}): {e}")
+                return False
+    
     def test_connection(self) -> bool:
         """Test if Ollama is available."""
         try:
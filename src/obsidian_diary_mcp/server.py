@@ -1,3 +1,5 @@
+import asyncio
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Annotated
 
@@ -11,7 +13,18 @@ from .analysis import analysis_engine
 from .template_generator import template_generator
 from .logger import server_logger
 
-mcp = FastMCP("obsidian-diary")
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """Warm up the Ollama model in the background while the server starts accepting requests."""
+    warmup = asyncio.create_task(analysis_engine.warmup())
+    try:
+        yield
+    finally:
+        warmup.cancel()
+
+
+mcp = FastMCP("obsidian-diary", lifespan=lifespan)
 
 server_logger.info(f"Diary Path: {DIARY_PATH}")
 server_logger.info(f"Planner Path: {PLANNER_PATH}")
@@ -100,9 +113,12 @@ async def complete_diary_entry(
         return f"No memory log found for {date}. Create one first."
 
     content = entry_manager.read_entry(file_path)
-    related = await analysis_engine.find_related_entries(content, exclude_date=date)
+    if content is None:
+        return f"Error reading memory log for {date}"
 
-    themes = await analysis_engine.extract_themes_and_topics(content)
+    themes, related = await analysis_engine.analyze_entry_bundle(
+        content, exclude_date=date
+    )
     topic_tags = analysis_engine.generate_topic_tags(themes)
     
     content = entry_manager.add_memory_links(content, related, topic_tags)
@@ -147,9 +163,12 @@ async def update_entry_backlinks(
         return f"No memory log found for {date}"
 
     content = entry_manager.read_entry(file_path)
-    related = await analysis_engine.find_related_entries(content, exclude_date=date)
+    if content is None:
+        return f"Error reading memory log for {date}"
 
-    themes = await analysis_engine.extract_themes_and_topics(content)
+    themes, related = await analysis_engine.analyze_entry_bundle(
+        content, exclude_date=date
+    )
     topic_tags = analysis_engine.generate_topic_tags(themes)
     
     content = entry_manager.add_memory_links(content, related, topic_tags)
@@ -199,13 +218,13 @@ async def refresh_recent_backlinks(
         try:
             content = entry_manager.read_entry(file_path)
             
-            if content.startswith("Error reading file"):
-                errors.append(f"{file_path.stem}: {content}")
+            if content is None:
+                errors.append(f"{file_path.stem}: Read error")
                 continue
                 
-            related = await analysis_engine.find_related_entries(content, exclude_date=file_path.stem)
-            
-            themes = await analysis_engine.extract_themes_and_topics(content)
+            themes, related = await analysis_engine.analyze_entry_bundle(
+                content, exclude_date=file_path.stem
+            )
             topic_tags = analysis_engine.generate_topic_tags(themes)
             
             content = entry_manager.add_memory_links(content, related, topic_tags)
@@ -250,7 +269,11 @@ def read_diary_entry(
     if not entry_manager.entry_exists(entry_date):
         return f"No memory log found for {date}"
 
-    return entry_manager.read_entry(file_path)
+    content = entry_manager.read_entry(file_path)
+    if content is None:
+        return f"Error reading memory log for {date}"
+
+    return content
 
 
 @mcp.tool(
@@ -303,11 +326,14 @@ async def show_themes(
     from collections import Counter
     theme_frequency = Counter()
     
+    items = []
     for date, file_path in recent_entries:
         content = entry_manager.read_entry(file_path)
-        if not content.startswith("Error"):
-            themes = await analysis_engine.get_themes_cached(content, file_path.stem)
-            theme_frequency.update(themes)
+        if content is not None:
+            items.append((content, file_path.stem))
+    
+    for themes in await analysis_engine.get_themes_batch(items):
+        theme_frequency.update(themes)
     
     if not theme_frequency:
         return f"No themes identified in the last {days} days"
@@ -368,7 +394,9 @@ async def generate_memory_trace_analysis(
     
     print(f"Generating Memory Trace for {len(recent_entries)} entries from last {days} days...")
     
-    trace_content = await generate_memory_trace(recent_entries, analysis_engine, entry_manager)
+    trace_content = "".join([
+        section async for section in generate_memory_trace(recent_entries, analysis_engine, entry_manager)
+    ])
     
     if save_to_file:
         trace_filename = f"memory-trace-{datetime.now().strftime('%Y-%m-%d')}.md"
@@ -413,8 +441,8 @@ async def extract_todos(
     print(f"📝 Extracting todos from {date}...")
     
     content = entry_manager.read_entry(file_path)
-    if content.startswith("Error reading file"):
-        return f"Error reading entry: {content}"
+    if content is None:
+        return f"Error reading entry for {date}"
     
     todos = await analysis_engine.extract_todos(content)
     
@@ -0,0 +1,137 @@
+"""MinHash signatures and LSH banding for finding lexically similar entries."""
+
+import hashlib
+import random
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randint(1, _MERSENNE_PRIME - 1), _rng.randint(0, _MERSENNE_PRIME - 1))
+    for _ in range(NUM_PERM)
+]
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> Set[int]:
+    """Hash every run of `size` characters (after collapsing whitespace) to a stable 64-bit int."""
+    text = " ".join(text.split())
+    if len(text) < size:
+        return {_hash(text)} if text else set()
+    return {_hash(text[i:i + size]) for i in range(len(text) - size + 1)}
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit hash of a string (unlike hash(), not salted per process)."""
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest())
+
+
+def simhash(text: str) -> int:
+    """64-bit SimHash of whitespace tokens, weighted by token frequency."""
+    weights = [0] * 64
+    for token, count in Counter(text.lower().split()).items():
+        token_hash = _hash(token)
+        for bit in range(64):
+            weights[bit] += count if token_hash >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def minhash(shingle_hashes: Iterable[int]) -> List[int]:
+    """Compute a NUM_PERM-slot MinHash signature from shingle hashes."""
+    hashes = list(shingle_hashes)
+    if not hashes:
+        return [_MAX_HASH] * NUM_PERM
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+class ShingleVocabulary:
+    """Assigns each shingle of a reference set a bit position so other sets can be compared to it as int bitmasks."""
+
+    def __init__(self, shingle_hashes: Iterable[int]):
+        self._positions: Dict[int, int] = {h: i for i, h in enumerate(shingle_hashes)}
+
+    def mask(self, shingle_hashes: Iterable[int]) -> int:
+        """Encode shingle hashes as a bitmask; hashes outside the reference set can't intersect it and are dropped."""
+        positions_by_hash = self._positions
+        bits = bytearray(len(positions_by_hash) // 8 + 1)
+        for h in shingle_hashes:
+            position = positions_by_hash.get(h)
+            if position is not None:
+                bits[position >> 3] |= 1 << (position & 7)
+        return int.from_bytes(bits, "little")
+
+
+def mask_jaccard(a: int, a_count: int, b: int, b_count: int) -> float:
+    """Exact Jaccard similarity of two bitmask-encoded sets with known sizes."""
+    if not a_count or not b_count:
+        return 0.0
+    intersection = (a & b).bit_count()
+    return intersection / (a_count + b_count - intersection)
+
+
+def _rows_per_band(threshold: float, num_perm: int) -> int:
+    """Pick the most rows per band whose banding threshold (1/b)^(1/r) stays at or below `threshold`."""
+    rows = 1
+    for r in range(1, num_perm + 1):
+        if num_perm % r == 0 and (r / num_perm) ** (1 / r) <= threshold:
+            rows = r
+    return rows
+
+
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures."""
+
+    def __init__(self, threshold: float, num_perm: int = NUM_PERM):
+        self.rows = _rows_per_band(threshold, num_perm)
+        self.bands = num_perm // self.rows
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [
+            defaultdict(set) for _ in range(self.bands)
+        ]
+        self._keys: Dict[str, List[Tuple[int, ...]]] = {}
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        """Split a signature into one bucket key per band."""
+        return [
+            tuple(signature[i * self.rows:(i + 1) * self.rows])
+            for i in range(self.bands)
+        ]
+
+    def insert(self, key: str, signature: List[int]) -> None:
+        """Add a signature under `key`, replacing any previous one."""
+        if key in self._keys:
+            self.remove(key)
+        band_keys = self._band_keys(signature)
+        for bucket, band_key in zip(self._buckets, band_keys):
+            bucket[band_key].add(key)
+        self._keys[key] = band_keys
+
+    def remove(self, key: str) -> None:
+        """Drop `key` from the index if present."""
+        band_keys = self._keys.pop(key, None)
+        if band_keys is None:
+            return
+        for bucket, band_key in zip(self._buckets, band_keys):
+            members = bucket.get(band_key)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del bucket[band_key]
+
+    def query(self, signature: List[int]) -> Set[str]:
+        """Return keys sharing at least one band with `signature`."""
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        return candidates
+
+    def __len__(self) -> int:
+        """Number of indexed keys."""
+        return len(self._keys)
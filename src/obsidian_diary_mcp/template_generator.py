@@ -36,9 +36,14 @@ class TemplateGenerator:
             recent_entries = [(date, path) for date, path in all_entries if three_days_ago <= date < entry_date]
             logger.info(f"Regular day: Analyzing {len(recent_entries)} entries from past 3 calendar days ({three_days_ago.strftime('%Y-%m-%d')} to {(entry_date - timedelta(days=1)).strftime('%Y-%m-%d')})")
         
+        readable_entries = [
+            (date, content)
+            for date, path in recent_entries
+            if (content := entry_manager.read_entry(path)) is not None
+        ]
         recent_text = "\n\n".join(
-            f"## {'MOST RECENT ENTRY' if i == 0 else 'Earlier entry'} ({date.strftime('%Y-%m-%d')}):\n{entry_manager.read_entry(path)}"
-            for i, (date, path) in enumerate(recent_entries)
+            f"## {'MOST RECENT ENTRY' if i == 0 else 'Earlier entry'} ({date.strftime('%Y-%m-%d')}):\n{content}"
+            for i, (date, content) in enumerate(readable_entries)
         )
         logger.info(f"Context: {len(recent_text):,} chars from {len(recent_entries)} entries (weighted by recency)")
         